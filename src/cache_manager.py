@@ -11,7 +11,7 @@ from dataclasses import dataclass
 from datetime import UTC, datetime
 import json
 from pathlib import Path
-from typing import Any, TypedDict, cast
+from typing import Any, NotRequired, TypedDict, cast
 
 CACHE_DIR = Path("cache")
 MANIFEST_FILE = CACHE_DIR / "manifest.json"
@@ -23,6 +23,8 @@ class CachedSourceData(TypedDict):
     cache_file: str
     url: str
     content_hash: str
+    etag: NotRequired[str | None]
+    last_modified: NotRequired[str | None]
 
 
 class ManifestData(TypedDict):
@@ -47,6 +49,8 @@ class CachedSource:
     cache_file: str
     url: str
     content_hash: str
+    etag: str | None = None
+    last_modified: str | None = None
 
 
 def cache_exists() -> bool:
@@ -70,26 +74,40 @@ def save_to_cache(
     content: str,
     url: str,
     content_hash: str,
+    *,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    manifest: ManifestData | None = None,
 ) -> None:
     """
     Save fetched source content to cache.
 
-    Updates the manifest with source metadata.
+    Updates the manifest with source metadata, including the response's
+    ETag/Last-Modified validators for conditional requests on the next run.
+
+    When caching many sources, pass a manifest loaded once with
+    load_manifest(): the entry is recorded in it without touching disk,
+    and the caller writes it once with save_manifest() at the end.
     """
     ensure_cache_dir()
 
     cache_file = get_cache_file_path(source_index)
     cache_file.write_text(content, encoding="utf-8")
 
-    manifest = load_manifest()
+    deferred = manifest is not None
+    if manifest is None:
+        manifest = load_manifest()
     manifest["cached_at"] = datetime.now(UTC).isoformat()
     manifest["sources"][source_name] = {
         "cache_file": cache_file.name,
         "url": url,
         "content_hash": content_hash,
+        "etag": etag,
+        "last_modified": last_modified,
     }
 
-    save_manifest(manifest)
+    if not deferred:
+        save_manifest(manifest)
 
 
 def load_from_cache(source_name: str) -> Iterator[str]:
@@ -118,6 +136,54 @@ def load_from_cache(source_name: str) -> Iterator[str]:
             yield line.rstrip("\r\n")
 
 
+def get_parsed_cache_path(cache_key: str) -> Path:
+    """Get the parsed-domains cache file path for a cache key."""
+    return CACHE_DIR / "parsed" / f"{cache_key}.txt"
+
+
+def load_parsed_domains(cache_key: str) -> str | None:
+    """
+    Load a previously parsed domain block from cache.
+
+    Returns:
+        Newline-terminated domain block, or None if not cached
+    """
+    parsed_file = get_parsed_cache_path(cache_key)
+    if not parsed_file.exists():
+        return None
+    return parsed_file.read_text(encoding="utf-8")
+
+
+def save_parsed_domains(cache_key: str, domain_block: str) -> None:
+    """
+    Save a parsed domain block to cache under the given key.
+
+    Written to a temp file and renamed into place, so an interrupted run
+    can never leave a truncated block that later runs would trust.
+    """
+    parsed_file = get_parsed_cache_path(cache_key)
+    parsed_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = parsed_file.with_suffix(".tmp")
+    temp_file.write_text(domain_block, encoding="utf-8")
+    temp_file.replace(parsed_file)
+
+
+def prune_parsed_cache(keep_keys: set[str]) -> None:
+    """
+    Remove parsed-domain cache entries whose key is not in keep_keys.
+
+    Also clears temp files left behind by interrupted saves.
+    """
+    parsed_dir = CACHE_DIR / "parsed"
+    if not parsed_dir.exists():
+        return
+    for parsed_file in parsed_dir.glob("*.txt"):
+        if parsed_file.stem not in keep_keys:
+            parsed_file.unlink()
+    for temp_file in parsed_dir.glob("*.tmp"):
+        temp_file.unlink()
+
+
 def load_manifest() -> ManifestData:
     """Load the cache manifest file."""
     if not MANIFEST_FILE.exists():
@@ -154,6 +220,8 @@ def get_cached_sources() -> dict[str, CachedSource]:
             cache_file=data["cache_file"],
             url=data["url"],
             content_hash=data["content_hash"],
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
         )
 
     return result
@@ -10,25 +10,42 @@ Main entry point that knows all business logic:
 from __future__ import annotations
 
 import argparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import UTC, datetime
+from functools import cache
+import hashlib
 import json
+import multiprocessing
 from pathlib import Path
 import sys
-from typing import Any
+from typing import Any, TextIO
 
+from src import domain_processor
 from src.cache_manager import (
+    CachedSource,
     cache_exists,
+    get_cache_file_path,
     get_cache_stats,
+    get_cached_sources,
     load_from_cache,
+    load_manifest,
+    load_parsed_domains,
+    prune_parsed_cache,
+    save_manifest,
+    save_parsed_domains,
     save_to_cache,
     validate_cache,
 )
 from src.config import SourceConfig, load_sources, load_whitelist, save_sources
-from src.domain_processor import extract_domains_from_lines
-from src.fetcher import FetchError, fetch_url_with_hash
-from src.hosts_generator import generate_hosts_file_from_file
-from src.pipeline import ContributionStats, PipelineFiles, process_annotated_pipeline
+from src.domain_processor import extract_domains_from_lines, extract_domains_from_text
+from src.fetcher import FetchedContent, FetchError, fetch_url_with_hash
+from src.hosts_generator import IO_BUFFER_SIZE, generate_hosts_file_from_file
+from src.pipeline import (
+    ContributionStats,
+    PipelineFiles,
+    process_annotated_pipeline,
+)
 from src.state_manager import (
     check_stale_sources,
     load_state,
@@ -37,7 +54,20 @@ from src.state_manager import (
     update_source_state,
 )
 
-MAX_WORKERS = 5
+# Fetch threads spend their time blocked in curl with the GIL released, so
+# this bounds open connections rather than CPU use
+MAX_WORKERS = 16
+
+# Bump when the layout of parsed-domain cache blocks changes, including any
+# change to build_domain_block or extract_domain_block below; the parser
+# fingerprint only hashes domain_processor.py
+PARSED_CACHE_VERSION = 2
+
+# README section markers replaced on every compile
+STATS_START_MARKER = "<!-- STATS_START -->"
+STATS_END_MARKER = "<!-- STATS_END -->"
+ACK_START_MARKER = "<!-- ACKNOWLEDGMENTS_START -->"
+ACK_END_MARKER = "<!-- ACKNOWLEDGMENTS_END -->"
 
 
 def build_header(
@@ -68,6 +98,81 @@ def build_header(
     return header
 
 
+def build_domain_block(domains: Iterator[str]) -> str:
+    """
+    Join domains into a newline-terminated block, dropping repeats.
+
+    Duplicates within one source are removed by dict.fromkeys, which builds
+    the table in a single C-level loop and keeps first-seen order.
+    """
+    unique_domains = dict.fromkeys(domains)
+    if not unique_domains:
+        return ""
+    return "\n".join(unique_domains) + "\n"
+
+
+def extract_domain_block(content: str) -> str:
+    """
+    Extract domains from raw source content as a newline-terminated block.
+
+    Runs in a parse worker process. The result comes back as one string,
+    which pickles far more cheaply than a list of millions of domains, and
+    is stored as-is in the parsed-domain cache.
+    """
+    return build_domain_block(extract_domains_from_text(content))
+
+
+def write_annotated_block(f_out: TextIO, domain_block: str, source_id: int) -> int:
+    """
+    Write a newline-terminated domain block to the annotated stream.
+
+    Returns:
+        Number of domains written
+    """
+    f_out.write(domain_block.replace("\n", f"\t{source_id}\n"))
+    return domain_block.count("\n")
+
+
+@cache
+def get_parser_fingerprint() -> str:
+    """Hash of the domain parser source, so parser changes invalidate parsed caches."""
+    parser_source = Path(domain_processor.__file__).read_bytes()
+    return hashlib.sha256(parser_source, usedforsecurity=False).hexdigest()
+
+
+def get_parsed_cache_key(content_hash: str) -> str:
+    """Parsed-domain cache key for source content with the given hash."""
+    key_material = f"{PARSED_CACHE_VERSION}:{content_hash}:{get_parser_fingerprint()}".encode()
+    return hashlib.sha256(key_material, usedforsecurity=False).hexdigest()
+
+
+def find_reusable_cache(
+    sources: list[SourceConfig],
+) -> dict[str, CachedSource]:
+    """
+    Find cached sources whose content can stand in for a 304 response.
+
+    An entry qualifies only if it was fetched from the same URL and sits in
+    the cache slot this source writes to, so no other source can overwrite
+    it during the run.
+    """
+    cached_sources = get_cached_sources()
+    reusable: dict[str, CachedSource] = {}
+
+    for source_id, source in enumerate(sources):
+        cached = cached_sources.get(source.name)
+        if (
+            cached
+            and (cached.etag or cached.last_modified)
+            and cached.url == source.url
+            and cached.cache_file == get_cache_file_path(source_id).name
+            and get_cache_file_path(source_id).exists()
+        ):
+            reusable[source.name] = cached
+
+    return reusable
+
+
 def collect_sources_with_hashes(
     sources: list[SourceConfig],
     output_file: Path,
@@ -76,8 +181,13 @@ def collect_sources_with_hashes(
     """
     Fetch all sources, compute hashes, check for changes, and save to cache.
 
-    Format per line: domain<TAB>source_id<TAB>is_general
-    where is_general is 1 for non-NSFW sources and 0 otherwise.
+    Fetching runs on threads (I/O bound); domain parsing is CPU bound, so each
+    fetched source is handed to a process pool to run outside the GIL.
+    Parsed domains are cached by content hash, so unchanged sources skip
+    parsing entirely on the next run. Sources with cached validators are
+    fetched with a conditional GET; a 304 replays the cached content.
+
+    Format per line: domain<TAB>source_id
     """
     source_stats: dict[str, int] = {}
     name_to_id = {s.name: idx for idx, s in enumerate(sources)}
@@ -87,47 +197,116 @@ def collect_sources_with_hashes(
     current_time = datetime.now(UTC)
 
     with (
-        output_file.open("w", encoding="utf-8") as f_out,
+        output_file.open("w", encoding="utf-8", buffering=IO_BUFFER_SIZE) as f_out,
         ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor,
+        # spawn, not fork: forking while fetch threads are mid-transfer is unsafe
+        ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn")) as parse_pool,
     ):
-        future_to_source = {executor.submit(fetch_url_with_hash, s.url): s for s in sources}
-
-        for future in as_completed(future_to_source):
-            source = future_to_source[future]
-            is_nsfw = source.nsfw
-            is_general_flag = 0 if is_nsfw else 1
-            source_id = name_to_id[source.name]
-            nsfw_tag = "  [NSFW]" if is_nsfw else ""
-
-            print(f"Fetching {source.name}{nsfw_tag}...")
-
-            try:
-                content_hash, raw_content, lines = future.result()
-                new_hashes[source.name] = content_hash
-
-                # Save fetched content to cache for compile-only mode
-                save_to_cache(source.name, source_id, raw_content, source.url, content_hash)
-
-                # Check if hash changed and update state
-                changed = update_source_state(state, source, content_hash, current_time)
-                if changed:
-                    print("  Content CHANGED (hash mismatch)")
-                    any_changed = True
-                else:
-                    print("  Content unchanged (hash match)")
-
-                # Write domains to annotated stream
-                count = 0
-                for domain in extract_domains_from_lines(lines):
-                    f_out.write(f"{domain}\t{source_id}\t{is_general_flag}\n")
-                    count += 1
+        reusable_cache = find_reusable_cache(sources)
+        # Loaded once and written once below, rather than once per fetched source
+        manifest = load_manifest()
+        future_to_source: dict[Future[FetchedContent | None], SourceConfig] = {}
+        for s in sources:
+            cached = reusable_cache.get(s.name)
+            etag = cached.etag if cached else None
+            last_modified = cached.last_modified if cached else None
+            future = executor.submit(
+                fetch_url_with_hash, s.url, etag=etag, last_modified=last_modified
+            )
+            future_to_source[future] = s
+        # Sources whose bodies hash identically (mirrors) share one parse
+        parse_to_sources: dict[Future[str], list[SourceConfig]] = {}
+        pending_parses: dict[str, Future[str]] = {}
+        parsed_cache_keys: dict[str, str] = {}
+
+        try:
+            for future in as_completed(future_to_source):
+                source = future_to_source[future]
+                is_nsfw = source.nsfw
+                source_id = name_to_id[source.name]
+                nsfw_tag = "  [NSFW]" if is_nsfw else ""
+
+                print(f"Fetching {source.name}{nsfw_tag}...")
+
+                try:
+                    fetched = future.result()
+                    raw_content: str | None
+                    if fetched is None:
+                        # Not modified: the cached body is already in place
+                        print("  Not modified (conditional request)")
+                        content_hash = reusable_cache[source.name].content_hash
+                        raw_content = None
+                    else:
+                        content_hash = fetched.content_hash
+                        raw_content = fetched.content
+
+                        # Save fetched content to cache for compile-only mode
+                        save_to_cache(
+                            source.name,
+                            source_id,
+                            raw_content,
+                            source.url,
+                            content_hash,
+                            etag=fetched.etag,
+                            last_modified=fetched.last_modified,
+                            manifest=manifest,
+                        )
+
+                    new_hashes[source.name] = content_hash
+
+                    # Check if hash changed and update state
+                    changed = update_source_state(state, source, content_hash, current_time)
+                    if changed:
+                        print("  Content CHANGED (hash mismatch)")
+                        any_changed = True
+                    else:
+                        print("  Content unchanged (hash match)")
+
+                    cache_key = get_parsed_cache_key(content_hash)
+                    parsed_cache_keys[source.name] = cache_key
+                    domain_block = load_parsed_domains(cache_key)
+                    if domain_block is not None:
+                        count = write_annotated_block(f_out, domain_block, source_id)
+                        source_stats[source.name] = count
+                        print(f"  Reused parsed cache: {count:,} domains")
+                    elif cache_key in pending_parses:
+                        parse_to_sources[pending_parses[cache_key]].append(source)
+                        print("  Identical content already being parsed")
+                    else:
+                        if raw_content is None:
+                            raw_content = "\n".join(load_from_cache(source.name))
+                        parse_future = parse_pool.submit(extract_domain_block, raw_content)
+                        pending_parses[cache_key] = parse_future
+                        parse_to_sources[parse_future] = [source]
+
+                except FetchError as e:
+                    print(f"  Error: {e}", file=sys.stderr)
+                    source_stats[source.name] = 0
+        finally:
+            # Bodies are written as they arrive; keep their metadata in step even
+            # if the loop is interrupted
+            save_manifest(manifest)
+
+        # Write domains to annotated stream as each parse finishes
+        for parse_future in as_completed(parse_to_sources):
+            parsed_sources = parse_to_sources[parse_future]
+            domain_block = parse_future.result()
+            save_parsed_domains(parsed_cache_keys[parsed_sources[0].name], domain_block)
+            for source in parsed_sources:
+                source_id = name_to_id[source.name]
+                count = write_annotated_block(f_out, domain_block, source_id)
 
                 source_stats[source.name] = count
-                print(f"  Found {count:,} domains")
+                print(f"Parsed {source.name}: found {count:,} domains")
 
-            except FetchError as e:
-                print(f"  Error: {e}", file=sys.stderr)
-                source_stats[source.name] = 0
+    # Keep entries for every source's last known content, not just this run's
+    # fetches, so a transient fetch failure doesn't force a full re-parse
+    keep_keys = set(parsed_cache_keys.values())
+    for source in sources:
+        cached_entry = manifest["sources"].get(source.name)
+        if cached_entry:
+            keep_keys.add(get_parsed_cache_key(cached_entry["content_hash"]))
+    prune_parsed_cache(keep_keys)
 
     return source_stats, id_to_name, new_hashes, any_changed
 
@@ -139,8 +318,7 @@ def collect_sources_from_cache(
     """
     Load sources from cache and process domains.
 
-    Format per line: domain<TAB>source_id<TAB>is_general
-    where is_general is 1 for non-NSFW sources and 0 otherwise.
+    Format per line: domain<TAB>source_id
 
     Sources not found in cache are skipped with a warning.
     """
@@ -148,10 +326,9 @@ def collect_sources_from_cache(
     name_to_id = {s.name: idx for idx, s in enumerate(sources)}
     id_to_name = {idx: s.name for idx, s in enumerate(sources)}
 
-    with output_file.open("w", encoding="utf-8") as f_out:
+    with output_file.open("w", encoding="utf-8", buffering=IO_BUFFER_SIZE) as f_out:
         for source in sources:
             is_nsfw = source.nsfw
-            is_general_flag = 0 if is_nsfw else 1
             source_id = name_to_id[source.name]
             nsfw_tag = "  [NSFW]" if is_nsfw else ""
 
@@ -160,11 +337,8 @@ def collect_sources_from_cache(
             try:
                 lines = load_from_cache(source.name)
 
-                # Write domains to annotated stream
-                count = 0
-                for domain in extract_domains_from_lines(lines):
-                    f_out.write(f"{domain}\t{source_id}\t{is_general_flag}\n")
-                    count += 1
+                domain_block = build_domain_block(extract_domains_from_lines(lines))
+                count = write_annotated_block(f_out, domain_block, source_id)
 
                 source_stats[source.name] = count
                 print(f"  Found {count:,} domains")
@@ -192,14 +366,12 @@ def update_readme(
             source_list, key=lambda s: contributions.get(s.name, 0), reverse=True
         )
 
-        rows = []
-        for source in sorted_sources:
-            total = source_stats.get(source.name, 0)
-            unique = contributions.get(source.name, 0)
-            rows.append(
-                f"<tr><td><a href='{source.url}'>{source.name}</a></td>"
-                f"<td>{total:,}</td><td>{unique:,}</td></tr>"
-            )
+        rows = "\n".join(
+            f"<tr><td><a href='{source.url}'>{source.name}</a></td>"
+            f"<td>{source_stats.get(source.name, 0):,}</td>"
+            f"<td>{contributions.get(source.name, 0):,}</td></tr>"
+            for source in sorted_sources
+        )
 
         return f"""<table align="center">
 <!-- markdownlint-disable MD013 -->
@@ -211,7 +383,7 @@ def update_readme(
 </tr>
 </thead>
 <tbody>
-{chr(10).join(rows)}
+{rows}
 </tbody>
 </table>
 <!-- markdownlint-enable MD013 -->"""
@@ -224,10 +396,10 @@ def update_readme(
 
     content = readme_path.read_text(encoding="utf-8")
 
-    stats_start = content.find("<!-- STATS_START -->")
-    stats_end = content.find("<!-- STATS_END -->")
+    before_stats, found_start, rest = content.partition(STATS_START_MARKER)
+    _old_stats, found_end, after_stats = rest.partition(STATS_END_MARKER)
 
-    if stats_start == -1 or stats_end == -1:
+    if not found_start or not found_end:
         print("Warning: README.md missing stats markers", file=sys.stderr)
         return
 
@@ -243,7 +415,7 @@ def update_readme(
     except ValueError:
         last_update_badge = last_update.replace(" ", "_").replace("-", "--")
 
-    stats_section = f"""<!-- STATS_START -->
+    stats_section = f"""{STATS_START_MARKER}
 
 ## Latest Run
 
@@ -267,31 +439,25 @@ def update_readme(
 > **Unique Contribution** shows how many domains would disappear if that source were removed.
 > Sources with low unique counts (~50 or less) provide minimal value.
 
-<!-- STATS_END -->"""
+{STATS_END_MARKER}"""
 
-    new_content = (
-        content[:stats_start] + stats_section + content[stats_end + len("<!-- STATS_END -->") :]
-    )
+    new_content = before_stats + stats_section + after_stats
 
     # Update acknowledgments section
-    ack_start = new_content.find("<!-- ACKNOWLEDGMENTS_START -->")
-    ack_end = new_content.find("<!-- ACKNOWLEDGMENTS_END -->")
+    before_ack, found_start, rest = new_content.partition(ACK_START_MARKER)
+    _old_ack, found_end, after_ack = rest.partition(ACK_END_MARKER)
 
-    if ack_start != -1 and ack_end != -1:
+    if found_start and found_end:
         acknowledgments = build_acknowledgments(sources)
-        ack_section = f"""<!-- ACKNOWLEDGMENTS_START -->
+        ack_section = f"""{ACK_START_MARKER}
 
 Thanks to the maintainers of all source blocklists:
 
 {acknowledgments}
 
-<!-- ACKNOWLEDGMENTS_END -->"""
+{ACK_END_MARKER}"""
 
-        new_content = (
-            new_content[:ack_start]
-            + ack_section
-            + new_content[ack_end + len("<!-- ACKNOWLEDGMENTS_END -->") :]
-        )
+        new_content = before_ack + ack_section + after_ack
 
     readme_path.write_text(new_content, encoding="utf-8")
     print("Updated README.md with dual statistics tables")
@@ -467,8 +633,9 @@ def main() -> int:
         hosts_nsfw_path = blocklists_dir / "hosts_nsfw"
 
         print("\nProcessing through sort and group-by pipeline...")
+        general_ids = {idx for idx, s in enumerate(sources) if not s.nsfw}
         all_count, general_count, contribution_stats, whitelisted_count = (
-            process_annotated_pipeline(pipeline, id_to_name, whitelist)
+            process_annotated_pipeline(pipeline, id_to_name, general_ids, whitelist)
         )
 
         print(f"\n  Total unique domains (general): {general_count:,}")
@@ -12,7 +12,7 @@ from pathlib import Path
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class SourceConfig:
     """Configuration for a single source list."""
 
@@ -53,30 +53,49 @@ class SourceConfig:
         return result
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Whitelist:
-    """Whitelist containing exact domains and wildcard patterns."""
+    """
+    Whitelist containing exact domains and wildcard patterns.
+
+    Frozen with wildcards as a tuple, so the suffix index built at
+    construction can never go stale.
+    """
 
     exact: set[str] = field(default_factory=set)
-    wildcards: list[str] = field(default_factory=list)
+    wildcards: tuple[str, ...] = ()
+    _wildcard_suffixes: frozenset[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Index wildcard patterns by the suffix they cover."""
+        suffixes = frozenset(pattern[2:] for pattern in self.wildcards if pattern.startswith("*."))
+        object.__setattr__(self, "_wildcard_suffixes", suffixes)
 
     def is_whitelisted(self, domain: str) -> bool:
         """
         Check if domain matches whitelist.
 
-        Exact matches are checked first (O(1)), then wildcard patterns.
+        Exact matches are checked first (O(1)), then the domain and each of
+        its parent domains are looked up in the wildcard suffix set, so the
+        cost depends on label count rather than the number of wildcards.
         Wildcard patterns like *.example.com match both example.com
         and any subdomain like foo.example.com.
         """
         if domain in self.exact:
             return True
 
-        for pattern in self.wildcards:
-            if pattern.startswith("*."):
-                suffix = pattern[2:]
-                if domain == suffix or domain.endswith("." + suffix):
-                    return True
-        return False
+        suffixes = self._wildcard_suffixes
+        if not suffixes:
+            return False
+
+        candidate = domain
+        while True:
+            if candidate in suffixes:
+                return True
+            dot = candidate.find(".")
+            if dot == -1:
+                return False
+            candidate = candidate[dot + 1 :]
 
 
 def load_sources(config_path: Path = Path("blocklists.json")) -> list[SourceConfig]:
@@ -132,7 +151,7 @@ def load_whitelist(whitelist_path: Path = Path("whitelist.txt")) -> Whitelist:
     wildcards: list[str] = []
 
     if not whitelist_path.exists():
-        return Whitelist(exact=exact, wildcards=wildcards)
+        return Whitelist(exact=exact, wildcards=tuple(wildcards))
 
     with whitelist_path.open(encoding="utf-8") as f:
         for raw_line in f:
@@ -146,4 +165,4 @@ def load_whitelist(whitelist_path: Path = Path("whitelist.txt")) -> Whitelist:
             else:
                 exact.add(domain)
 
-    return Whitelist(exact=exact, wildcards=wildcards)
+    return Whitelist(exact=exact, wildcards=tuple(wildcards))
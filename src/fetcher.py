@@ -6,12 +6,14 @@ Generic URL fetching - no knowledge of blocklists or their purpose.
 
 from __future__ import annotations
 
-from collections.abc import Iterator
+from dataclasses import dataclass
+from functools import cache
 import hashlib
 
 from curl_cffi import requests
 
 REQUEST_TIMEOUT = 30
+HTTP_NOT_MODIFIED = 304
 
 
 class FetchError(Exception):
@@ -20,39 +22,75 @@ class FetchError(Exception):
     pass
 
 
-def fetch_url_with_hash(url: str, timeout: int = REQUEST_TIMEOUT) -> tuple[str, str, Iterator[str]]:
+@dataclass(frozen=True, slots=True)
+class FetchedContent:
+    """Body and cache validators of a successful fetch."""
+
+    content_hash: str
+    content: str
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+@cache
+def get_session() -> requests.Session[requests.Response]:
+    """
+    Get the shared HTTP session.
+
+    Reusing one session keeps connections (and TLS sessions) alive between
+    requests to the same host. curl_cffi gives each thread its own curl
+    handle, so the session is safe to share across fetch threads.
+    """
+    return requests.Session(impersonate="chrome120")
+
+
+def fetch_url_with_hash(
+    url: str,
+    timeout: int = REQUEST_TIMEOUT,
+    *,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> FetchedContent | None:
     """
     Fetch URL content and compute SHA256 hash.
 
     Uses curl_cffi with browser impersonation to handle anti-bot measures.
+    Validators from a previous response are sent as If-None-Match /
+    If-Modified-Since, so unchanged content costs no body transfer.
 
     Args:
         url: URL to fetch
         timeout: Request timeout in seconds
+        etag: ETag from the previous response, if any
+        last_modified: Last-Modified from the previous response, if any
 
     Returns:
-        Tuple of (content_hash, raw_content, line_iterator)
+        FetchedContent, or None if validators were sent and the server
+        reports the content unchanged (304)
 
     Raises:
         FetchError: If request fails
     """
+    headers: dict[str, str] = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
     try:
-        response = requests.get(
-            url,
-            timeout=timeout,
-            impersonate="chrome120",
-            verify=True,
-        )
+        response = get_session().get(url, headers=headers, timeout=timeout, verify=True)
+        if headers and response.status_code == HTTP_NOT_MODIFIED:
+            return None
         response.raise_for_status()
 
-        response_text = response.text
-        content_hash = hashlib.sha256(response_text.encode("utf-8")).hexdigest()
-
-        def line_generator() -> Iterator[str]:
-            for line in response_text.split("\n"):
-                yield line.rstrip("\r")
-
-        return content_hash, response_text, line_generator()
+        # Hash the body bytes as received; re-encoding the decoded text would
+        # copy the whole body again just to get the same bytes back
+        return FetchedContent(
+            content_hash=hashlib.sha256(response.content, usedforsecurity=False).hexdigest(),
+            content=response.text,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
 
     except Exception as e:
         raise FetchError(f"Failed to fetch {url}: {e}") from e
@@ -60,4 +98,4 @@ def fetch_url_with_hash(url: str, timeout: int = REQUEST_TIMEOUT) -> tuple[str,
 
 def compute_content_hash(content: str) -> str:
     """Compute SHA256 hash of content."""
-    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return hashlib.sha256(content.encode("utf-8"), usedforsecurity=False).hexdigest()
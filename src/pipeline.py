@@ -8,10 +8,34 @@ Operates on generic "sources" with "categories".
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import cache
+import os
 from pathlib import Path
 import subprocess
 
 from src.config import Whitelist
+from src.hosts_generator import IO_BUFFER_SIZE
+
+# Memory sort may use before spilling to temp files (GNU sort -S syntax)
+SORT_BUFFER_SIZE = "25%"
+
+# Deduplicated domains buffered per output before being written as one block
+WRITE_BATCH_SIZE = 65_536
+
+
+@cache
+def is_gnu_sort() -> bool:
+    """
+    Check whether the system sort is GNU coreutils.
+
+    The buffer size and --parallel options are GNU extensions; BSD/macOS
+    sort rejects them, so they are only passed when GNU sort is present.
+    """
+    try:
+        result = subprocess.run(["sort", "--version"], capture_output=True, text=True, check=False)
+    except OSError:
+        return False
+    return "GNU coreutils" in result.stdout
 
 
 @dataclass(frozen=True)
@@ -19,7 +43,6 @@ class PipelineFiles:
     """Temporary file paths for annotated domain processing pipeline."""
 
     annotated: Path
-    sorted: Path
     domains_all: Path
     domains_general: Path
 
@@ -28,7 +51,6 @@ class PipelineFiles:
         """Create temp file paths for the processing pipeline."""
         return cls(
             annotated=base_dir / "temp_annotated.txt",
-            sorted=base_dir / "temp_sorted.txt",
             domains_all=base_dir / "temp_domains_all.txt",
             domains_general=base_dir / "temp_domains_general.txt",
         )
@@ -36,7 +58,6 @@ class PipelineFiles:
     def cleanup(self) -> None:
         """Remove all temporary files."""
         self.annotated.unlink(missing_ok=True)
-        self.sorted.unlink(missing_ok=True)
         self.domains_all.unlink(missing_ok=True)
         self.domains_general.unlink(missing_ok=True)
 
@@ -52,13 +73,15 @@ class ContributionStats:
 def process_annotated_pipeline(
     pipeline: PipelineFiles,
     id_to_name: dict[int, str],
+    general_ids: set[int],
     whitelist: Whitelist,
     quiet: bool = False,
 ) -> tuple[int, int, ContributionStats, int]:
     """
     Process annotated stream through sort and streaming group-by pipeline.
 
-    Single external sort by domain, then streaming group-by that:
+    Single external sort by domain, piped straight into a streaming group-by
+    (the sorted stream is never written to disk) that:
     - Writes deduplicated domains to ALL output (sorted)
     - Writes deduplicated domains to GENERAL output (sorted, derived in same pass)
     - Computes per-source contribution counters for both aggregates
@@ -67,11 +90,16 @@ def process_annotated_pipeline(
     Contribution metric: domains appearing in exactly one source within each aggregate.
     This matches "how many domains would disappear if source were removed."
 
-    Input format: domain<TAB>source_id<TAB>is_general (1 or 0)
+    Input format: domain<TAB>source_id
+
+    Category membership is a property of the source, not of each line, so
+    it is applied per domain as a precomputed source bitmask rather than
+    being carried through the sort on every line.
 
     Args:
         pipeline: PipelineFiles containing input/output paths
         id_to_name: Mapping of source IDs to names
+        general_ids: Source IDs belonging to the GENERAL category
         whitelist: Whitelist object for domain filtering
         quiet: If True, suppress progress output
 
@@ -81,37 +109,49 @@ def process_annotated_pipeline(
     if not quiet:
         print("  Sorting annotated stream...")
 
-    subprocess.run(
-        [
-            "sort",
-            "-t",
-            "\t",
-            "-k1,1",
-            "-k2,2n",
-            str(pipeline.annotated),
-            "-o",
-            str(pipeline.sorted),
-        ],
-        check=True,
-    )
-
-    if not quiet:
-        print("  Streaming group-by with contribution calculation...")
+    sort_cmd = ["sort", "-t", "\t", "-k1,1", "-k2,2n"]
+    if is_gnu_sort():
+        sort_cmd += ["-S", SORT_BUFFER_SIZE, f"--parallel={os.cpu_count() or 1}"]
+    sort_cmd.append(str(pipeline.annotated))
+    # Byte-order collation: much faster than locale-aware comparison and
+    # matches Python's str ordering of the ASCII domains
+    sort_env = {**os.environ, "LC_ALL": "C"}
 
     all_count = 0
     general_count = 0
     whitelisted_count = 0
-    contrib_all: dict[str, int] = dict.fromkeys(id_to_name.values(), 0)
-    contrib_general: dict[str, int] = dict.fromkeys(id_to_name.values(), 0)
+    # Indexed by source ID; mapped to names once the stream is consumed
+    source_count = max(id_to_name, default=-1) + 1
+    contrib_all = [0] * source_count
+    contrib_general = [0] * source_count
+    general_source_mask = sum(1 << source_id for source_id in general_ids)
 
     with (
-        pipeline.sorted.open("r", encoding="utf-8") as f_in,
-        pipeline.domains_all.open("w", encoding="utf-8") as f_all,
-        pipeline.domains_general.open("w", encoding="utf-8") as f_gen,
+        subprocess.Popen(
+            sort_cmd,
+            stdout=subprocess.PIPE,
+            env=sort_env,
+            bufsize=IO_BUFFER_SIZE,
+        ) as sort_proc,
+        pipeline.domains_all.open("wb", buffering=IO_BUFFER_SIZE) as f_all,
+        pipeline.domains_general.open("wb", buffering=IO_BUFFER_SIZE) as f_gen,
     ):
-        current_domain: str | None = None
-        sources_all: set[int] = set()
-        sources_general: set[int] = set()
+        # Domains stay as bytes end to end (they are pure ASCII), so the hot
+        # loop pays for neither UTF-8 decoding nor str allocation per line
+        current_domain: bytes | None = None
+        # Source membership as bitmasks: bit N set means source N lists the domain
+        mask_all = 0
+        batch_all: list[bytes] = []
+        batch_general: list[bytes] = []
+
+        def write_batches() -> None:
+            """Write buffered domains to each output with a single call."""
+            if batch_all:
+                f_all.write(b"\n".join(batch_all) + b"\n")
+                batch_all.clear()
+            if batch_general:
+                f_gen.write(b"\n".join(batch_general) + b"\n")
+                batch_general.clear()
 
         def flush_domain() -> None:
             """Process accumulated data for current domain and write outputs."""
@@ -119,46 +159,57 @@ def process_annotated_pipeline(
             if current_domain is None:
                 return
 
-            if whitelist.is_whitelisted(current_domain):
+            if whitelist.is_whitelisted(current_domain.decode()):
                 whitelisted_count += 1
                 return
 
-            f_all.write(f"{current_domain}\n")
+            batch_all.append(current_domain)
             all_count += 1
 
-            if sources_general:
-                f_gen.write(f"{current_domain}\n")
+            mask_general = mask_all & general_source_mask
+
+            if mask_general:
+                batch_general.append(current_domain)
                 general_count += 1
 
-            # Contribution: domains appearing in exactly one source
-            if len(sources_all) == 1:
-                only_source_id = next(iter(sources_all))
-                contrib_all[id_to_name[only_source_id]] += 1
+            if len(batch_all) >= WRITE_BATCH_SIZE:
+                write_batches()
 
-            if len(sources_general) == 1:
-                only_source_id = next(iter(sources_general))
-                contrib_general[id_to_name[only_source_id]] += 1
+            # Contribution: domains appearing in exactly one source (one bit set)
+            if mask_all.bit_count() == 1:
+                contrib_all[mask_all.bit_length() - 1] += 1
 
-        for line in f_in:
-            parts = line.rstrip("\n").split("\t")
-            if len(parts) != 3:
+            if mask_general.bit_count() == 1:
+                contrib_general[mask_general.bit_length() - 1] += 1
+
+        assert sort_proc.stdout is not None  # guaranteed by stdout=PIPE
+        if not quiet:
+            print("  Streaming group-by with contribution calculation...")
+
+        for line in sort_proc.stdout:
+            parts = line.rstrip(b"\n").split(b"\t")
+            if len(parts) != 2:
                 continue
 
-            domain, source_id_str, is_general_str = parts
-            source_id = int(source_id_str)
-            is_general = is_general_str == "1"
+            domain, source_id_str = parts
 
             if domain != current_domain:
                 flush_domain()
                 current_domain = domain
-                sources_all.clear()
-                sources_general.clear()
+                mask_all = 0
 
-            sources_all.add(source_id)
-            if is_general:
-                sources_general.add(source_id)
+            mask_all |= 1 << int(source_id_str)
 
         flush_domain()
+        write_batches()
 
-    stats = ContributionStats(contrib_all=contrib_all, contrib_general=contrib_general)
+    if sort_proc.returncode:
+        raise subprocess.CalledProcessError(sort_proc.returncode, sort_cmd)
+
+    stats = ContributionStats(
+        contrib_all={name: contrib_all[source_id] for source_id, name in id_to_name.items()},
+        contrib_general={
+            name: contrib_general[source_id] for source_id, name in id_to_name.items()
+        },
+    )
     return all_count, general_count, stats, whitelisted_count
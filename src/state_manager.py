@@ -7,7 +7,7 @@ Minimal knowledge of business logic - treats source metadata as opaque.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 from pathlib import Path
 from typing import Any
@@ -18,7 +18,7 @@ STATE_FILE = Path("state.json")
 STALE_THRESHOLD_DAYS = 180
 
 
-@dataclass
+@dataclass(slots=True)
 class SourceState:
     """State tracking for a single source."""
 
@@ -56,7 +56,7 @@ class SourceState:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CompilationState:
     """Overall compilation state."""
 
@@ -139,6 +139,8 @@ def check_stale_sources(
     """
     active_sources: list[SourceConfig] = []
     purged_any = False
+    # Stale means more than threshold_days whole days since the last change
+    stale_cutoff = current_time - timedelta(days=threshold_days + 1)
 
     for source in sources:
         if source.preserve:
@@ -149,13 +151,11 @@ def check_stale_sources(
 
         if source_state and source_state.last_changed_date:
             try:
-                last_changed = datetime.fromisoformat(
-                    source_state.last_changed_date.replace("Z", "+00:00")
-                )
-                days_stale = (current_time - last_changed).days
+                last_changed = datetime.fromisoformat(source_state.last_changed_date)
 
-                if days_stale > threshold_days:
+                if last_changed <= stale_cutoff:
                     if not quiet:
+                        days_stale = (current_time - last_changed).days
                         print(f"WARNING: Purging stale source: {source.name}")
                         print(
                             f"         No updates for {days_stale} days "
@@ -193,7 +193,7 @@ def should_force_compile(state: CompilationState, current_time: datetime) -> boo
         return True
 
     try:
-        last_compile = datetime.fromisoformat(state.last_compilation.replace("Z", "+00:00"))
+        last_compile = datetime.fromisoformat(state.last_compilation)
     except ValueError:
         return True  # Invalid date - force compile
 
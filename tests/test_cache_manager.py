@@ -10,6 +10,10 @@ from src.cache_manager import (
     get_cached_sources,
     load_from_cache,
     load_manifest,
+    load_parsed_domains,
+    prune_parsed_cache,
+    save_manifest,
+    save_parsed_domains,
     save_to_cache,
     validate_cache,
 )
@@ -92,6 +96,26 @@ class TestSaveToCache:
         manifest = load_manifest()
         assert len(manifest["sources"]) == 2
 
+    def test_save_into_loaded_manifest(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a passed manifest is updated in memory and only written by the caller."""
+        cache_dir = tmp_path / "cache"
+        manifest_file = cache_dir / "manifest.json"
+        monkeypatch.setattr("src.cache_manager.CACHE_DIR", cache_dir)
+        monkeypatch.setattr("src.cache_manager.MANIFEST_FILE", manifest_file)
+
+        manifest = load_manifest()
+        save_to_cache("Source 1", 0, "content1", "url1", "hash1", manifest=manifest)
+        save_to_cache("Source 2", 1, "content2", "url2", "hash2", manifest=manifest)
+
+        assert (cache_dir / "source_1.txt").exists()
+        assert not manifest_file.exists()
+
+        save_manifest(manifest)
+
+        assert len(load_manifest()["sources"]) == 2
+
 
 class TestLoadFromCache:
     """Tests for loading source content from cache."""
@@ -131,6 +155,46 @@ class TestLoadFromCache:
             list(load_from_cache("Any Source"))
 
 
+class TestParsedDomainCache:
+    """Tests for the parsed-domain cache."""
+
+    def test_save_and_load_roundtrip(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test saved domain block is returned unchanged for its key."""
+        monkeypatch.setattr("src.cache_manager.CACHE_DIR", tmp_path / "cache")
+
+        assert load_parsed_domains("key1") is None
+
+        save_parsed_domains("key1", "a.com\nb.com\n")
+
+        assert load_parsed_domains("key1") == "a.com\nb.com\n"
+
+    def test_prune_removes_unused_keys(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test prune_parsed_cache keeps only the given keys."""
+        monkeypatch.setattr("src.cache_manager.CACHE_DIR", tmp_path / "cache")
+
+        save_parsed_domains("keep", "a.com\n")
+        save_parsed_domains("stale", "b.com\n")
+        prune_parsed_cache({"keep"})
+
+        assert load_parsed_domains("keep") == "a.com\n"
+        assert load_parsed_domains("stale") is None
+
+    def test_save_leaves_no_temp_file(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test saving replaces the entry atomically and leaves only the final file."""
+        monkeypatch.setattr("src.cache_manager.CACHE_DIR", tmp_path / "cache")
+
+        save_parsed_domains("key1", "a.com\n")
+        save_parsed_domains("key1", "b.com\n")
+
+        parsed_dir = tmp_path / "cache" / "parsed"
+        assert [p.name for p in parsed_dir.iterdir()] == ["key1.txt"]
+        assert load_parsed_domains("key1") == "b.com\n"
+
+
 class TestValidateCache:
     """Tests for cache validation."""
 
@@ -196,6 +260,28 @@ class TestGetCachedSources:
         assert result["Test Source"].cache_file == "source_0.txt"
         assert result["Test Source"].url == "https://example.com"
         assert result["Test Source"].content_hash == "hash123"
+        assert result["Test Source"].etag is None
+
+    def test_get_cached_validators(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test ETag/Last-Modified validators survive the manifest roundtrip."""
+        cache_dir = tmp_path / "cache"
+        manifest_file = cache_dir / "manifest.json"
+        monkeypatch.setattr("src.cache_manager.CACHE_DIR", cache_dir)
+        monkeypatch.setattr("src.cache_manager.MANIFEST_FILE", manifest_file)
+
+        save_to_cache(
+            "Test Source",
+            0,
+            "content",
+            "https://example.com",
+            "hash123",
+            etag='"abc"',
+            last_modified="Wed, 21 Oct 2015 07:28:00 GMT",
+        )
+
+        cached = get_cached_sources()["Test Source"]
+        assert cached.etag == '"abc"'
+        assert cached.last_modified == "Wed, 21 Oct 2015 07:28:00 GMT"
 
 
 class TestGetCacheStats:
@@ -0,0 +1,275 @@
+"""Tests for src/cli.py.
+
+Covers source collection against the local caches: conditional requests,
+parsed-domain cache reuse, and parse sharing. Network and the parse
+process pool are replaced with in-process fakes.
+"""
+
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+import hashlib
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.cache_manager import get_cached_sources, load_manifest, load_parsed_domains, save_to_cache
+from src.cli import collect_sources_with_hashes, find_reusable_cache, get_parsed_cache_key
+from src.config import SourceConfig
+from src.fetcher import FetchedContent, FetchError
+from src.state_manager import CompilationState
+
+
+class FakeFetcher:
+    """Serves fixed bodies per URL, answering 304 when the sent ETag matches."""
+
+    def __init__(self, bodies: dict[str, str]) -> None:
+        self.bodies = bodies
+        self.requests: list[tuple[str, str | None]] = []
+        self.failing: set[str] = set()
+
+    def etag_for(self, url: str) -> str:
+        return hashlib.sha256(self.bodies[url].encode()).hexdigest()[:16]
+
+    def __call__(
+        self,
+        url: str,
+        timeout: int = 30,  # noqa: ARG002
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,  # noqa: ARG002
+    ) -> FetchedContent | None:
+        self.requests.append((url, etag))
+        if url in self.failing:
+            raise FetchError(f"Failed to fetch {url}")
+        current_etag = self.etag_for(url)
+        if etag == current_etag:
+            return None
+        body = self.bodies[url]
+        return FetchedContent(
+            content_hash=hashlib.sha256(body.encode()).hexdigest(),
+            content=body,
+            etag=current_etag,
+        )
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point the cache at a temp directory."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("src.cache_manager.CACHE_DIR", cache_dir)
+    monkeypatch.setattr("src.cache_manager.MANIFEST_FILE", cache_dir / "manifest.json")
+    return cache_dir
+
+
+@pytest.fixture
+def parse_submissions(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Run parses on a thread instead of a spawned process, recording each submission."""
+    submissions: list[str] = []
+
+    class InlineParsePool(ThreadPoolExecutor):
+        def __init__(self, **_kwargs: Any) -> None:
+            super().__init__(max_workers=1)
+
+        def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future[Any]:
+            submissions.append(args[0])
+            return super().submit(fn, *args, **kwargs)
+
+    monkeypatch.setattr("src.cli.ProcessPoolExecutor", InlineParsePool)
+    return submissions
+
+
+def use_fetcher(monkeypatch: pytest.MonkeyPatch, bodies: dict[str, str]) -> FakeFetcher:
+    """Replace network fetches with a FakeFetcher serving the given bodies."""
+    fetcher = FakeFetcher(bodies)
+    monkeypatch.setattr("src.cli.fetch_url_with_hash", fetcher)
+    return fetcher
+
+
+def collect(sources: list[SourceConfig], output_file: Path) -> tuple[dict[str, int], str]:
+    """Run collection and return per-source counts and the annotated stream."""
+    source_stats, _, _, _ = collect_sources_with_hashes(sources, output_file, CompilationState())
+    return source_stats, output_file.read_text()
+
+
+@pytest.mark.usefixtures("cache_dir")
+class TestFindReusableCache:
+    """Tests for which cached entries may stand in for a 304 response."""
+
+    def test_entry_with_validator_is_reusable(self) -> None:
+        """Test an entry with a validator, same URL and its own slot qualifies."""
+        save_to_cache("A", 0, "a.com\n", "https://a", "hash", etag='"v1"')
+
+        reusable = find_reusable_cache([SourceConfig(name="A", url="https://a")])
+
+        assert reusable["A"].etag == '"v1"'
+
+    def test_entry_without_validator_is_skipped(self) -> None:
+        """Test an entry with neither ETag nor Last-Modified is not reused."""
+        save_to_cache("A", 0, "a.com\n", "https://a", "hash")
+
+        assert find_reusable_cache([SourceConfig(name="A", url="https://a")]) == {}
+
+    def test_changed_url_is_skipped(self) -> None:
+        """Test an entry cached from a different URL is not reused."""
+        save_to_cache("A", 0, "a.com\n", "https://old", "hash", etag='"v1"')
+
+        assert find_reusable_cache([SourceConfig(name="A", url="https://a")]) == {}
+
+    def test_different_slot_is_skipped(self) -> None:
+        """Test an entry in another source's slot is not reused after reordering."""
+        save_to_cache("A", 1, "a.com\n", "https://a", "hash", etag='"v1"')
+
+        assert find_reusable_cache([SourceConfig(name="A", url="https://a")]) == {}
+
+    def test_missing_file_is_skipped(self, cache_dir: Path) -> None:
+        """Test an entry whose cache file was deleted is not reused."""
+        save_to_cache("A", 0, "a.com\n", "https://a", "hash", etag='"v1"')
+        (cache_dir / "source_0.txt").unlink()
+
+        assert find_reusable_cache([SourceConfig(name="A", url="https://a")]) == {}
+
+
+@pytest.mark.usefixtures("cache_dir", "parse_submissions")
+class TestConditionalCollection:
+    """Tests for conditional requests in collect_sources_with_hashes."""
+
+    def test_not_modified_replays_cached_body(
+        self,
+        tmp_path: Path,
+        parse_submissions: list[str],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test a 304 reuses the cached body and content hash."""
+        sources = [SourceConfig(name="A", url="https://a")]
+        fetcher = use_fetcher(monkeypatch, {"https://a": "a.com\nb.com\n"})
+        _, first_stream = collect(sources, tmp_path / "first.txt")
+        first_hash = get_cached_sources()["A"].content_hash
+
+        # Force a re-parse so the body must come from the raw cache
+        monkeypatch.setattr("src.cli.load_parsed_domains", lambda _key: None)
+        source_stats, second_stream = collect(sources, tmp_path / "second.txt")
+
+        assert fetcher.requests == [
+            ("https://a", None),
+            ("https://a", fetcher.etag_for("https://a")),
+        ]
+        assert parse_submissions[1] == "a.com\nb.com"
+        assert second_stream == first_stream == "a.com\t0\nb.com\t0\n"
+        assert source_stats == {"A": 2}
+        assert get_cached_sources()["A"].content_hash == first_hash
+
+    def test_changed_content_updates_validators(
+        self,
+        tmp_path: Path,
+        cache_dir: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test a 200 after a change stores the new body, hash and ETag."""
+        sources = [SourceConfig(name="A", url="https://a")]
+        fetcher = use_fetcher(monkeypatch, {"https://a": "a.com\n"})
+        collect(sources, tmp_path / "first.txt")
+        old_etag = fetcher.etag_for("https://a")
+
+        fetcher.bodies["https://a"] = "c.com\n"
+        _, stream = collect(sources, tmp_path / "second.txt")
+
+        cached = load_manifest()["sources"]["A"]
+        assert fetcher.requests[-1] == ("https://a", old_etag)
+        assert stream == "c.com\t0\n"
+        assert cached.get("etag") == fetcher.etag_for("https://a")
+        assert cached["content_hash"] == hashlib.sha256(b"c.com\n").hexdigest()
+        assert (cache_dir / "source_0.txt").read_text() == "c.com\n"
+
+
+@pytest.mark.usefixtures("cache_dir")
+class TestParsedCacheReuse:
+    """Tests for the parsed-domain cache in collect_sources_with_hashes."""
+
+    def test_cache_hit_skips_parse_pool(
+        self, tmp_path: Path, parse_submissions: list[str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a cached block is written without submitting a parse."""
+        sources = [SourceConfig(name="A", url="https://a")]
+        use_fetcher(monkeypatch, {"https://a": "a.com\nb.com\n"})
+        collect(sources, tmp_path / "first.txt")
+
+        source_stats, stream = collect(sources, tmp_path / "second.txt")
+
+        assert len(parse_submissions) == 1
+        assert stream == "a.com\t0\nb.com\t0\n"
+        assert source_stats == {"A": 2}
+
+    def test_parser_change_misses_cache(
+        self, tmp_path: Path, parse_submissions: list[str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a different parser fingerprint forces a fresh parse."""
+        sources = [SourceConfig(name="A", url="https://a")]
+        use_fetcher(monkeypatch, {"https://a": "a.com\n"})
+        collect(sources, tmp_path / "first.txt")
+
+        monkeypatch.setattr("src.cli.get_parser_fingerprint", lambda: "changed-parser")
+        _, stream = collect(sources, tmp_path / "second.txt")
+
+        assert len(parse_submissions) == 2
+        assert stream == "a.com\t0\n"
+
+    @pytest.mark.usefixtures("parse_submissions")
+    def test_fetch_failure_keeps_parsed_entry(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a source that fails to fetch keeps its parsed entry for the next run."""
+        sources = [SourceConfig(name="A", url="https://a"), SourceConfig(name="B", url="https://b")]
+        fetcher = use_fetcher(monkeypatch, {"https://a": "a.com\n", "https://b": "b.com\n"})
+        collect(sources, tmp_path / "first.txt")
+        b_key = get_parsed_cache_key(get_cached_sources()["B"].content_hash)
+
+        fetcher.failing.add("https://b")
+        source_stats, _ = collect(sources, tmp_path / "second.txt")
+
+        assert source_stats["B"] == 0
+        assert load_parsed_domains(b_key) == "b.com\n"
+
+
+@pytest.mark.usefixtures("cache_dir")
+class TestMirrorSharing:
+    """Tests for sharing one parse between sources with identical content."""
+
+    def test_identical_bodies_parsed_once(
+        self, tmp_path: Path, parse_submissions: list[str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test mirrors are parsed once and written under each source's id."""
+        body = "a.com\nb.com\na.com\n"
+        sources = [
+            SourceConfig(name="Primary", url="https://a"),
+            SourceConfig(name="Mirror", url="https://mirror"),
+        ]
+        use_fetcher(monkeypatch, {"https://a": body, "https://mirror": body})
+
+        source_stats, stream = collect(sources, tmp_path / "annotated.txt")
+
+        assert parse_submissions == [body]
+        assert source_stats == {"Primary": 2, "Mirror": 2}
+        assert sorted(stream.splitlines()) == ["a.com\t0", "a.com\t1", "b.com\t0", "b.com\t1"]
+
+
+@pytest.mark.usefixtures("cache_dir", "parse_submissions")
+class TestManifestConsistency:
+    """Tests for the deferred manifest write in collect_sources_with_hashes."""
+
+    def test_manifest_saved_when_loop_fails(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test an unexpected error still records metadata for bodies already written."""
+        use_fetcher(monkeypatch, {"https://a": "a.com\n"})
+
+        def fail(*_args: Any) -> bool:
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr("src.cli.update_source_state", fail)
+
+        with pytest.raises(RuntimeError):
+            collect([SourceConfig(name="A", url="https://a")], tmp_path / "annotated.txt")
+
+        cached = get_cached_sources()["A"]
+        assert cached.content_hash == hashlib.sha256(b"a.com\n").hexdigest()
@@ -3,6 +3,7 @@
 Tests configuration loading, validation, and whitelist matching.
 """
 
+from dataclasses import FrozenInstanceError
 from pathlib import Path
 
 import pytest
@@ -41,24 +42,42 @@ class TestWhitelist:
 
     def test_exact_match(self) -> None:
         """Test exact domain matching."""
-        whitelist = Whitelist(exact={"example.com"}, wildcards=[])
+        whitelist = Whitelist(exact={"example.com"}, wildcards=())
 
         assert whitelist.is_whitelisted("example.com") is True
         assert whitelist.is_whitelisted("other.com") is False
 
     def test_wildcard_match(self) -> None:
         """Test wildcard matching for subdomains."""
-        whitelist = Whitelist(exact=set(), wildcards=["*.example.com"])
+        whitelist = Whitelist(exact=set(), wildcards=("*.example.com",))
 
         assert whitelist.is_whitelisted("foo.example.com") is True
         assert whitelist.is_whitelisted("example.com") is True  # Base domain matches
         assert whitelist.is_whitelisted("notexample.com") is False
         assert whitelist.is_whitelisted("fooexample.com") is False  # Not a subdomain
 
+    def test_wildcard_match_deep_subdomain(self) -> None:
+        """Test wildcard matching walks every parent domain."""
+        whitelist = Whitelist(exact=set(), wildcards=("*.example.com", "*.other.org"))
+
+        assert whitelist.is_whitelisted("a.b.c.example.com") is True
+        assert whitelist.is_whitelisted("x.other.org") is True
+        assert whitelist.is_whitelisted("example.com.evil.net") is False
+        assert whitelist.is_whitelisted("com") is False
+
     def test_empty_whitelist(self) -> None:
         """Test empty whitelist matches nothing."""
         assert Whitelist().is_whitelisted("anything.com") is False
 
+    def test_wildcards_cannot_change_after_construction(self) -> None:
+        """Test the wildcard index cannot go stale through later mutation."""
+        whitelist = Whitelist(wildcards=("*.example.com",))
+
+        with pytest.raises(FrozenInstanceError):
+            whitelist.wildcards = ("*.other.org",)  # type: ignore[misc]
+
+        assert whitelist.is_whitelisted("foo.example.com") is True
+
 
 class TestLoadSources:
     """Tests for load_sources validation logic."""
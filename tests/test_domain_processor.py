@@ -2,6 +2,7 @@
 
 from src.domain_processor import (
     extract_domains_from_lines,
+    extract_domains_from_text,
     is_valid_domain,
 )
 
@@ -63,6 +64,11 @@ class TestIsValidDomain:
         assert is_valid_domain("ex-ample.com") is True
         assert is_valid_domain("my-domain-name.org") is True
 
+    def test_invalid_characters(self) -> None:
+        """Test characters outside letters, digits and hyphens are invalid."""
+        assert is_valid_domain("foo_bar.com") is False
+        assert is_valid_domain("exa mple.com") is False
+
 
 class TestExtractDomainsFromLines:
     """Tests for extract_domains_from_lines function."""
@@ -221,3 +227,49 @@ class TestExtractDomainsFromLines:
 
         assert "redgifs.com" in domains
         assert "pornhub.com" in domains
+
+    def test_rejects_malformed_labels(self) -> None:
+        """Test hyphen runs and overlong labels are rejected, not truncated."""
+        lines = iter(
+            [
+                "a" + "-" * 200,
+                "||" + "a" * 64 + ".com^",
+                "0.0.0.0 " + "a" * 64 + ".com",
+                "ok-" + "-" * 50 + "b.example.com",
+            ]
+        )
+        domains = list(extract_domains_from_lines(lines))
+
+        assert domains == ["ok-" + "-" * 50 + "b.example.com"]
+
+
+class TestExtractDomainsFromText:
+    """Tests for extract_domains_from_text function."""
+
+    def test_matches_line_extraction(self) -> None:
+        """Test whole-text scan yields the same domains as the line parser."""
+        text = "\r\n".join(
+            [
+                "# Title: mixed list",
+                "[Adblock Plus 2.0]",
+                "! comment",
+                "  0.0.0.0 Ads.Example.com  # inline",
+                "127.0.0.1 localhost",
+                "::1 ip6-localhost",
+                "||tracker.example.org^$third-party",
+                "  plain.example.net  ",
+                "not a domain line",
+                "",
+                "0.0.0.0\tlast.example.io",
+            ]
+        )
+
+        expected = list(extract_domains_from_lines(iter(text.split("\n"))))
+
+        assert list(extract_domains_from_text(text)) == expected
+        assert expected == [
+            "ads.example.com",
+            "tracker.example.org",
+            "plain.example.net",
+            "last.example.io",
+        ]
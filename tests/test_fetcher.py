@@ -4,30 +4,121 @@ Minimal tests for fetch wrapper integration. Most functionality is from curl_cff
 which is not controlled by this codebase - only the specific integration is tested.
 """
 
+from dataclasses import dataclass, field
+import hashlib
+from typing import Any
+
 import pytest
 
 from src.fetcher import FetchError, fetch_url_with_hash
 
 
+@dataclass
+class FakeResponse:
+    """Stand-in for a curl_cffi response."""
+
+    status_code: int
+    content: bytes = b""
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    """Session returning a canned response and recording request headers."""
+
+    def __init__(self, response: FakeResponse) -> None:
+        self.response = response
+        self.sent_headers: dict[str, str] = {}
+
+    def get(self, _url: str, headers: dict[str, str], **_kwargs: Any) -> FakeResponse:
+        self.sent_headers = headers
+        return self.response
+
+
+def use_session(monkeypatch: pytest.MonkeyPatch, response: FakeResponse) -> FakeSession:
+    """Route fetches through a FakeSession returning the given response."""
+    session = FakeSession(response)
+    monkeypatch.setattr("src.fetcher.get_session", lambda: session)
+    return session
+
+
+class TestConditionalFetch:
+    """Tests for conditional GET handling in fetch_url_with_hash."""
+
+    def test_sends_validators_and_returns_none_on_304(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test stored validators are sent and a 304 yields None."""
+        session = use_session(monkeypatch, FakeResponse(304))
+
+        fetched = fetch_url_with_hash(
+            "https://example.com", etag='"abc"', last_modified="Mon, 01 Jan 2024"
+        )
+
+        assert fetched is None
+        assert session.sent_headers == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Mon, 01 Jan 2024",
+        }
+
+    def test_200_returns_content_and_new_validators(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a full response returns body, hash, and the response's validators."""
+        body = b"a.com\r\nb.com\n"
+        use_session(
+            monkeypatch,
+            FakeResponse(200, body, {"ETag": '"new"', "Last-Modified": "Tue, 02 Jan 2024"}),
+        )
+
+        fetched = fetch_url_with_hash("https://example.com", etag='"old"')
+
+        assert fetched is not None
+        assert fetched.content == body.decode()
+        assert fetched.content_hash == hashlib.sha256(body).hexdigest()
+        assert fetched.etag == '"new"'
+        assert fetched.last_modified == "Tue, 02 Jan 2024"
+
+    def test_no_validators_sends_plain_get(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a source without stored validators is fetched unconditionally."""
+        session = use_session(monkeypatch, FakeResponse(200, b"a.com\n"))
+
+        fetched = fetch_url_with_hash("https://example.com")
+
+        assert fetched is not None
+        assert fetched.etag is None
+        assert session.sent_headers == {}
+
+    def test_http_error_raises_fetch_error(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that HTTP errors are wrapped in FetchError."""
+        use_session(monkeypatch, FakeResponse(404))
+
+        with pytest.raises(FetchError):
+            fetch_url_with_hash("https://example.com", etag='"abc"')
+
+
 class TestFetchUrlWithHash:
     """Tests for fetch_url_with_hash integration with curl_cffi."""
 
-    def test_fetch_returns_hash_content_and_lines(self) -> None:
-        """Test basic fetch returns valid hash, raw content, and iterable lines."""
+    def test_fetch_returns_hash_and_content(self) -> None:
+        """Test basic fetch returns valid hash and raw content."""
         url = "https://httpbin.org/robots.txt"
-        content_hash, raw_content, lines = fetch_url_with_hash(url)
+        fetched = fetch_url_with_hash(url)
+
+        assert fetched is not None
 
         # SHA256 hash format verification
-        assert len(content_hash) == 64
-        assert all(c in "0123456789abcdef" for c in content_hash)
+        assert len(fetched.content_hash) == 64
+        assert all(c in "0123456789abcdef" for c in fetched.content_hash)
 
         # Raw content verification
-        assert isinstance(raw_content, str)
-        assert len(raw_content) > 0
-
-        # Iterator consumption verification
-        lines_list = list(lines)
-        assert len(lines_list) > 0
+        assert isinstance(fetched.content, str)
+        assert len(fetched.content) > 0
 
     def test_http_error_raises_fetch_error(self) -> None:
         """Test that HTTP errors are wrapped in FetchError."""
@@ -5,19 +5,21 @@ Minimal tests for file I/O logic. This module is intentionally simple.
 
 from pathlib import Path
 
-from src.hosts_generator import generate_hosts_file, generate_hosts_file_from_file
+import pytest
 
+from src.hosts_generator import generate_hosts_file_from_file
 
-class TestGenerateHostsFile:
-    """Tests for generate_hosts_file - file I/O logic."""
+
+class TestGenerateHostsFileFromFile:
+    """Tests for generate_hosts_file_from_file - file I/O logic."""
 
     def test_writes_header_and_domains(self, tmp_path: Path) -> None:
         """Test basic hosts file generation."""
+        source = tmp_path / "domains.txt"
         output = tmp_path / "hosts"
-        header = ["# Header line"]
-        domains = iter(["example.com", "test.org"])
+        source.write_text("example.com\ntest.org\n")
 
-        count = generate_hosts_file(domains, output, header)
+        count = generate_hosts_file_from_file(source, output, ["# Header line"])
 
         assert count == 2
         content = output.read_text()
@@ -26,26 +28,28 @@ class TestGenerateHostsFile:
         assert "0.0.0.0 test.org\n" in content
 
     def test_skips_empty_domains(self, tmp_path: Path) -> None:
-        """Test empty/whitespace domains are skipped."""
+        """Test empty/whitespace lines are skipped."""
+        source = tmp_path / "domains.txt"
         output = tmp_path / "hosts"
-        domains = iter(["valid.com", "", "   ", "also-valid.com"])
+        source.write_text("valid.com\n\n   \nalso-valid.com\n")
 
-        count = generate_hosts_file(domains, output, ["# Test"])
+        count = generate_hosts_file_from_file(source, output, ["# Test"])
 
         assert count == 2
 
-
-class TestGenerateHostsFileFromFile:
-    """Tests for generate_hosts_file_from_file."""
-
-    def test_reads_from_file(self, tmp_path: Path) -> None:
-        """Test reading domains from source file."""
+    def test_writes_across_read_chunks(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test every domain is written when input spans several read chunks."""
+        monkeypatch.setattr("src.hosts_generator.HOSTS_READ_CHUNK_BYTES", 8)
         source = tmp_path / "domains.txt"
         output = tmp_path / "hosts"
+        domains = [f"d{i}.com" for i in range(5)]
+        source.write_text("".join(f"{domain}\n" for domain in domains))
 
-        source.write_text("example.com\ntest.org\n")
+        count = generate_hosts_file_from_file(source, output, ["# Test"])
 
-        count = generate_hosts_file_from_file(source, output, ["# Header"])
-
-        assert count == 2
-        assert "0.0.0.0 example.com" in output.read_text()
+        assert count == 5
+        assert output.read_text().split("\n\n", 1)[1] == "".join(
+            f"0.0.0.0 {domain}\n" for domain in domains
+        )
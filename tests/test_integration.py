@@ -8,7 +8,7 @@ from pathlib import Path
 import subprocess
 
 from src.config import SourceConfig, Whitelist, load_whitelist
-from src.domain_processor import extract_domains_from_lines
+from src.domain_processor import extract_domains_from_text
 from src.fetcher import fetch_url_with_hash
 from src.hosts_generator import generate_hosts_file_from_file
 from src.pipeline import PipelineFiles, process_annotated_pipeline
@@ -22,11 +22,12 @@ class TestEndToEndPipeline:
         """Test fetching and parsing a real blocklist."""
         url = "https://raw.githubusercontent.com/StevenBlack/hosts/master/alternates/porn/hosts"
 
-        content_hash, _raw_content, lines = fetch_url_with_hash(url, timeout=60)
+        fetched = fetch_url_with_hash(url, timeout=60)
 
-        assert len(content_hash) == 64
+        assert fetched is not None
+        assert len(fetched.content_hash) == 64
 
-        domains = list(extract_domains_from_lines(lines))
+        domains = list(extract_domains_from_text(fetched.content))
 
         assert len(domains) > 0
 
@@ -37,10 +38,10 @@ class TestEndToEndPipeline:
         whitelist = Whitelist()
 
         # Shared domain + unique domains
-        pipeline.annotated.write_text("shared.com\t0\t1\nshared.com\t1\t1\nunique.com\t0\t1\n")
+        pipeline.annotated.write_text("shared.com\t0\nshared.com\t1\nunique.com\t0\n")
 
         all_count, _general_count, stats, _ = process_annotated_pipeline(
-            pipeline, id_to_name, whitelist, quiet=True
+            pipeline, id_to_name, set(id_to_name), whitelist, quiet=True
         )
 
         assert all_count == 2  # shared + unique
@@ -56,9 +57,9 @@ class TestEndToEndPipeline:
         id_to_name = {0: "Source"}
         whitelist = Whitelist()
 
-        pipeline.annotated.write_text("example.com\t0\t1\n")
+        pipeline.annotated.write_text("example.com\t0\n")
 
-        process_annotated_pipeline(pipeline, id_to_name, whitelist, quiet=True)
+        process_annotated_pipeline(pipeline, id_to_name, set(id_to_name), whitelist, quiet=True)
 
         hosts_path = tmp_path / "blocklists" / "hosts"
         header = ["# YAHA Test"]
@@ -95,10 +96,10 @@ class TestEndToEndPipeline:
         pipeline = PipelineFiles.create(tmp_path)
         id_to_name = {0: "Source"}
 
-        pipeline.annotated.write_text("blocked.com\t0\t1\nallowed.com\t0\t1\n")
+        pipeline.annotated.write_text("blocked.com\t0\nallowed.com\t0\n")
 
         all_count, _, _, whitelisted_count = process_annotated_pipeline(
-            pipeline, id_to_name, whitelist, quiet=True
+            pipeline, id_to_name, set(id_to_name), whitelist, quiet=True
         )
 
         assert all_count == 1
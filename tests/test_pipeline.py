@@ -6,6 +6,8 @@ Whitelist tests are in test_config.py (single source of truth).
 
 from pathlib import Path
 
+import pytest
+
 from src.config import Whitelist
 from src.pipeline import PipelineFiles, process_annotated_pipeline
 
@@ -17,14 +19,13 @@ class TestPipelineFiles:
         """Test cleanup removes all temp files."""
         files = PipelineFiles.create(tmp_path)
 
-        for f in [files.annotated, files.sorted, files.domains_all, files.domains_general]:
+        for f in [files.annotated, files.domains_all, files.domains_general]:
             f.touch()
 
         files.cleanup()
 
         assert not any(
-            f.exists()
-            for f in [files.annotated, files.sorted, files.domains_all, files.domains_general]
+            f.exists() for f in [files.annotated, files.domains_all, files.domains_general]
         )
 
     def test_cleanup_handles_missing_files(self, tmp_path: Path) -> None:
@@ -43,13 +44,13 @@ class TestProcessAnnotatedPipeline:
         whitelist = Whitelist()
 
         files.annotated.write_text(
-            "example.com\t0\t1\n"
-            "example.com\t1\t1\n"  # Duplicate from different source
-            "other.com\t0\t1\n"
+            "example.com\t0\n"
+            "example.com\t1\n"  # Duplicate from different source
+            "other.com\t0\n"
         )
 
         all_count, general_count, _, _ = process_annotated_pipeline(
-            files, id_to_name, whitelist, quiet=True
+            files, id_to_name, set(id_to_name), whitelist, quiet=True
         )
 
         assert all_count == 2
@@ -63,11 +64,11 @@ class TestProcessAnnotatedPipeline:
         whitelist = Whitelist()
 
         # shared.com in both, unique1/unique2 in one each
-        files.annotated.write_text(
-            "shared.com\t0\t1\nshared.com\t1\t1\nunique1.com\t0\t1\nunique2.com\t1\t1\n"
-        )
+        files.annotated.write_text("shared.com\t0\nshared.com\t1\nunique1.com\t0\nunique2.com\t1\n")
 
-        _, _, stats, _ = process_annotated_pipeline(files, id_to_name, whitelist, quiet=True)
+        _, _, stats, _ = process_annotated_pipeline(
+            files, id_to_name, set(id_to_name), whitelist, quiet=True
+        )
 
         # shared.com doesn't count for either (appears in both)
         assert stats.contrib_all["Source1"] == 1  # unique1.com
@@ -75,18 +76,18 @@ class TestProcessAnnotatedPipeline:
         files.cleanup()
 
     def test_category_separation(self, tmp_path: Path) -> None:
-        """Test general (1) vs non-general (0) category separation."""
+        """Test only sources in general_ids feed the general output."""
         files = PipelineFiles.create(tmp_path)
         id_to_name = {0: "General", 1: "Other"}
         whitelist = Whitelist()
 
         files.annotated.write_text(
-            "general.com\t0\t1\n"  # General category
-            "other.com\t1\t0\n"  # Non-general category
+            "general.com\t0\n"  # General category
+            "other.com\t1\n"  # Non-general category
         )
 
         all_count, general_count, _, _ = process_annotated_pipeline(
-            files, id_to_name, whitelist, quiet=True
+            files, id_to_name, {0}, whitelist, quiet=True
         )
 
         assert all_count == 2  # Both in "all" output
@@ -97,12 +98,12 @@ class TestProcessAnnotatedPipeline:
         """Test whitelisted domains are excluded."""
         files = PipelineFiles.create(tmp_path)
         id_to_name = {0: "Source1"}
-        whitelist = Whitelist(exact={"blocked.com"}, wildcards=["*.safe.org"])
+        whitelist = Whitelist(exact={"blocked.com"}, wildcards=("*.safe.org",))
 
-        files.annotated.write_text("blocked.com\t0\t1\nsub.safe.org\t0\t1\nallowed.com\t0\t1\n")
+        files.annotated.write_text("blocked.com\t0\nsub.safe.org\t0\nallowed.com\t0\n")
 
         all_count, _, _, whitelisted_count = process_annotated_pipeline(
-            files, id_to_name, whitelist, quiet=True
+            files, id_to_name, set(id_to_name), whitelist, quiet=True
         )
 
         assert all_count == 1
@@ -115,10 +116,60 @@ class TestProcessAnnotatedPipeline:
         id_to_name = {0: "Source1"}
         whitelist = Whitelist()
 
-        files.annotated.write_text("zebra.com\t0\t1\napple.com\t0\t1\n")
+        files.annotated.write_text("zebra.com\t0\napple.com\t0\n")
 
-        process_annotated_pipeline(files, id_to_name, whitelist, quiet=True)
+        process_annotated_pipeline(files, id_to_name, set(id_to_name), whitelist, quiet=True)
 
         all_domains = files.domains_all.read_text().strip().split("\n")
         assert all_domains == ["apple.com", "zebra.com"]
         files.cleanup()
+
+    def test_sorted_output_uses_byte_order(self, tmp_path: Path) -> None:
+        """Test output order is byte order regardless of the user's locale."""
+        files = PipelineFiles.create(tmp_path)
+        id_to_name = {0: "Source1"}
+        whitelist = Whitelist()
+
+        files.annotated.write_text("ab.com\t0\na.b.com\t0\na-b.com\t0\n")
+
+        process_annotated_pipeline(files, id_to_name, set(id_to_name), whitelist, quiet=True)
+
+        all_domains = files.domains_all.read_text().strip().split("\n")
+        assert all_domains == sorted(all_domains)
+        files.cleanup()
+
+    def test_output_across_write_batches(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test buffered output is complete when it spans several write batches."""
+        monkeypatch.setattr("src.pipeline.WRITE_BATCH_SIZE", 2)
+        files = PipelineFiles.create(tmp_path)
+        id_to_name = {0: "General", 1: "Other"}
+        whitelist = Whitelist()
+
+        files.annotated.write_text("a.com\t0\nb.com\t1\nc.com\t0\nd.com\t1\ne.com\t0\n")
+
+        process_annotated_pipeline(files, id_to_name, {0}, whitelist, quiet=True)
+
+        assert files.domains_all.read_text() == "a.com\nb.com\nc.com\nd.com\ne.com\n"
+        assert files.domains_general.read_text() == "a.com\nc.com\ne.com\n"
+        files.cleanup()
+
+    def test_portable_sort_without_gnu_extensions(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the pipeline falls back to POSIX sort options without GNU sort."""
+        monkeypatch.setattr("src.pipeline.is_gnu_sort", lambda: False)
+        files = PipelineFiles.create(tmp_path)
+        id_to_name = {0: "Source1", 1: "Source2"}
+
+        files.annotated.write_text("zebra.com\t1\napple.com\t0\nzebra.com\t0\n")
+
+        all_count, _, stats, _ = process_annotated_pipeline(
+            files, id_to_name, set(id_to_name), Whitelist(), quiet=True
+        )
+
+        assert all_count == 2
+        assert files.domains_all.read_text() == "apple.com\nzebra.com\n"
+        assert stats.contrib_all == {"Source1": 1, "Source2": 0}
+        files.cleanup()
@@ -159,6 +159,31 @@ class TestCheckStaleSources:
         assert len(active) == 1
         assert purged is False
 
+    def test_stale_threshold_boundary(self) -> None:
+        """Test purge starts once a full day past the threshold has elapsed."""
+        now = datetime(2025, 6, 1, 12, tzinfo=UTC)
+
+        def source_changed_at(changed: datetime) -> CompilationState:
+            return CompilationState(
+                sources={
+                    "Edge": SourceState(
+                        url="https://example.com",
+                        content_hash="abc",
+                        last_fetch_date=now.isoformat(),
+                        last_changed_date=changed.isoformat().replace("+00:00", "Z"),
+                        fetch_count=1,
+                        change_count=1,
+                    )
+                }
+            )
+
+        sources = [SourceConfig(name="Edge", url="https://example.com")]
+        kept_state = source_changed_at(now - timedelta(days=181) + timedelta(seconds=1))
+        purged_state = source_changed_at(now - timedelta(days=181))
+
+        assert check_stale_sources(kept_state, sources, now, quiet=True)[1] is False
+        assert check_stale_sources(purged_state, sources, now, quiet=True)[1] is True
+
 
 class TestShouldForceCompile:
     """Tests for force compile decision logic."""